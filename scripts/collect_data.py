@@ -4,13 +4,33 @@ Data Collection Script
 Collects data from various public APIs and saves to raw data directory.
 """
 
+import asyncio
+import aiohttp
+import diskcache
 import requests
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential
+)
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import csv
 from datetime import datetime, timedelta
 import os
 import glob
+import gzip
+import hashlib
 import logging
+import re
+from urllib.parse import quote
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -20,6 +40,75 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def dumps_json(obj):
+    """Serialize obj to indented JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
+def loads_json(data):
+    """Parse JSON from bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Shared HTTP session so collectors reuse pooled connections
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+))
+SESSION.headers.update({
+    'Accept-Encoding': 'gzip',
+    'User-Agent': 'daily-pipeline/1.0'
+})
+
+# On-disk response cache so repeat runs within the hour skip the network
+CACHE = diskcache.Cache('data/cache')
+CACHE_TTL = 3600
+
+
+def cache_key(url, params=None):
+    """Build a cache key from the URL, query params and current hour."""
+    hour_bucket = datetime.now().strftime('%Y%m%d%H')
+    raw = url + str(sorted((params or {}).items())) + hour_bucket
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def get_json(url, params=None, headers=None):
+    """GET a JSON body via the shared session, served from the cache when fresh."""
+    key = cache_key(url, params)
+    body = CACHE.get(key)
+    if body is None:
+        response = SESSION.get(url, params=params, headers=headers, timeout=10)
+        response.raise_for_status()
+        body = loads_json(response.content)
+        CACHE.set(key, body, expire=CACHE_TTL)
+    return body
+
+
+def save_raw(source, rows, api_name, now=None):
+    """Save collected rows to data/raw as gzipped JSON with the standard envelope.
+
+    Returns the filename written.
+    """
+    now = now or datetime.now()
+    filename = f"data/raw/{source}_{now.strftime('%Y%m%d_%H%M%S')}.json.gz"
+
+    payload = dumps_json({
+        'collected_at': now.isoformat(),
+        'source': api_name,
+        'data': rows
+    })
+    with gzip.open(filename, 'wb', compresslevel=3) as f:
+        f.write(payload)
+
+    return filename
+
+
 def ensure_directories():
     """Ensure required directories exist."""
     directories = ['data/raw', 'data/processed', 'data/archive']
@@ -32,9 +121,11 @@ def collect_github_trending():
     """Collect genuinely trending repositories from GitHub (new repos gaining stars fast)."""
     logger.info("Collecting GitHub trending data...")
 
+    now = datetime.now()
+
     try:
         url = "https://api.github.com/search/repositories"
-        week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+        week_ago = (now - timedelta(days=7)).strftime('%Y-%m-%d')
         params = {
             'q': f'stars:>10 created:>{week_ago}',
             'sort': 'stars',
@@ -43,37 +134,27 @@ def collect_github_trending():
         }
 
         headers = {'Accept': 'application/vnd.github.v3+json'}
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
+        data = get_json(url, params=params, headers=headers)
 
-        trending_repos = []
-        for repo in data.get('items', [])[:10]:
-            trending_repos.append({
+        trending_repos = [
+            {
                 'name': repo['full_name'],
                 'stars': repo['stargazers_count'],
                 'language': repo['language'] or 'N/A',
                 'description': (repo['description'] or 'No description')[:100],
                 'url': repo['html_url'],
                 'created_at': repo['created_at']
-            })
-
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'data/raw/github_trending_{timestamp}.json'
+            }
+            for repo in data.get('items', [])[:10]
+        ]
 
-        with open(filename, 'w') as f:
-            json.dump({
-                'collected_at': datetime.now().isoformat(),
-                'source': 'GitHub API',
-                'data': trending_repos
-            }, f, indent=2)
+        filename = save_raw('github_trending', trending_repos, 'GitHub API', now)
 
-        logger.info(f"GitHub trending data saved to {filename}")
+        logger.info("GitHub trending data saved to %s", filename)
         return trending_repos
 
     except Exception as e:
-        logger.error(f"Error collecting GitHub data: {e}")
+        logger.error("Error collecting GitHub data: %s", e)
         return []
 
 
@@ -81,19 +162,17 @@ def collect_hn_stories():
     """Collect top Hacker News stories (no API key required)."""
     logger.info("Collecting Hacker News top stories...")
 
+    now = datetime.now()
+
     try:
         top_ids_url = "https://hacker-news.firebaseio.com/v0/topstories.json"
-        response = requests.get(top_ids_url, timeout=10)
-        response.raise_for_status()
-        top_ids = response.json()[:10]
+        top_ids = get_json(top_ids_url)[:10]
 
         stories = []
         for story_id in top_ids:
             try:
                 item_url = f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
-                r = requests.get(item_url, timeout=10)
-                r.raise_for_status()
-                item = r.json()
+                item = get_json(item_url)
 
                 if item and item.get('type') == 'story':
                     stories.append({
@@ -105,31 +184,23 @@ def collect_hn_stories():
                         'hn_url': f"https://news.ycombinator.com/item?id={story_id}"
                     })
             except Exception as e:
-                logger.warning(f"Error fetching HN story {story_id}: {e}")
+                logger.warning("Error fetching HN story %s: %s", story_id, e)
                 continue
 
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'data/raw/hn_stories_{timestamp}.json'
+        filename = save_raw('hn_stories', stories, 'Hacker News API', now)
 
-        with open(filename, 'w') as f:
-            json.dump({
-                'collected_at': datetime.now().isoformat(),
-                'source': 'Hacker News API',
-                'data': stories
-            }, f, indent=2)
-
-        logger.info(f"HN stories saved to {filename}")
+        logger.info("HN stories saved to %s", filename)
         return stories
 
     except Exception as e:
-        logger.error(f"Error collecting HN data: {e}")
+        logger.error("Error collecting HN data: %s", e)
         return []
 
 
 def cleanup_old_files(days_to_keep=7):
     """Delete raw and processed files older than days_to_keep."""
     cutoff = datetime.now() - timedelta(days=days_to_keep)
-    patterns = ['data/raw/*.json', 'data/processed/*.csv']
+    patterns = ['data/raw/*.json', 'data/raw/*.json.gz', 'data/processed/*.csv']
     removed = 0
     for pattern in patterns:
         for f in glob.glob(pattern):
@@ -137,67 +208,107 @@ def cleanup_old_files(days_to_keep=7):
                 mtime = datetime.fromtimestamp(os.path.getmtime(f))
                 if mtime < cutoff:
                     os.remove(f)
-                    logger.info(f"Removed old file: {f}")
+                    logger.info("Removed old file: %s", f)
                     removed += 1
             except Exception as e:
-                logger.warning(f"Could not remove {f}: {e}")
-    logger.info(f"Cleanup complete: {removed} old files removed")
+                logger.warning("Could not remove %s: %s", f, e)
+    logger.info("Cleanup complete: %s old files removed", removed)
+
+
+# wttr.in one-line format: temperature|condition|humidity|wind (metric units)
+WEATHER_FORMAT = '%t|%C|%h|%w'
+
+
+def parse_weather_line(line):
+    """Parse a wttr.in one-line response such as '+12°C|Cloudy|72%|↗10km/h'."""
+    temperature, condition, humidity, wind = line.strip().split('|')
+    temp_c = int(re.sub(r'[^\d-]', '', temperature))
+    return {
+        'temperature_c': str(temp_c),
+        'temperature_f': str(round(temp_c * 9 / 5 + 32)),
+        'condition': condition.strip(),
+        'humidity': re.search(r'\d+', humidity).group(),
+        'wind_speed_kmph': re.search(r'\d+', wind).group()
+    }
 
 
-def collect_weather_data():
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=0.3, max=2),
+    retry=retry_if_exception_type((aiohttp.ClientConnectionError, asyncio.TimeoutError)),
+    reraise=True
+)
+async def fetch_weather(city, session):
+    """Fetch current conditions for a single city from wttr.in.
+
+    Timeouts and connection errors are retried with exponential backoff;
+    HTTP error statuses are not. Only responses that parse are cached.
+    """
+    url = f"https://wttr.in/{city}?m&format={quote(WEATHER_FORMAT)}"
+    key = cache_key(url)
+    weather = CACHE.get(key)
+    if weather is None:
+        async with session.get(url) as response:
+            response.raise_for_status()
+            weather = parse_weather_line(await response.text())
+        CACHE.set(key, weather, expire=CACHE_TTL)
+    return city, weather
+
+
+async def collect_weather_data():
     """Collect weather data for Vancouver."""
     logger.info("Collecting weather data...")
+
+    now = datetime.now()
+    collected_at = now.isoformat()
     
     try:
         # Using wttr.in - a free weather API that doesn't require API key
         cities = ['Vancouver']
         weather_data = []
         
-        for city in cities:
+        # Fetch all cities concurrently over one shared session
+        timeout = aiohttp.ClientTimeout(total=10)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            results = await asyncio.gather(
+                *(fetch_weather(city, session) for city in cities),
+                return_exceptions=True
+            )
+        
+        for city, result in zip(cities, results):
             try:
-                url = f"https://wttr.in/{city}?format=j1"
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
+                if isinstance(result, Exception):
+                    raise result
                 
-                data = response.json()
-                current = data['current_condition'][0]
+                _, weather = result
                 
                 weather_data.append({
                     'city': city,
-                    'temperature_c': current['temp_C'],
-                    'temperature_f': current['temp_F'],
-                    'condition': current['weatherDesc'][0]['value'],
-                    'humidity': current['humidity'],
-                    'wind_speed_kmph': current['windspeedKmph'],
-                    'collected_at': datetime.now().isoformat()
+                    **weather,
+                    'collected_at': collected_at
                 })
                 
             except Exception as e:
-                logger.warning(f"Error collecting weather for {city}: {e}")
+                logger.warning("Error collecting weather for %s: %s", city, e)
                 continue
         
         # Save to file
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'data/raw/weather_{timestamp}.json'
+        filename = save_raw('weather', weather_data, 'wttr.in', now)
         
-        with open(filename, 'w') as f:
-            json.dump({
-                'collected_at': datetime.now().isoformat(),
-                'source': 'wttr.in',
-                'data': weather_data
-            }, f, indent=2)
-        
-        logger.info(f"Weather data saved to {filename}")
+        logger.info("Weather data saved to %s", filename)
         return weather_data
         
     except Exception as e:
-        logger.error(f"Error collecting weather data: {e}")
+        logger.error("Error collecting weather data: %s", e)
         return []
 
 
 def collect_crypto_prices():
     """Collect cryptocurrency prices."""
     logger.info("Collecting cryptocurrency data...")
+
+    now = datetime.now()
+    collected_at = now.isoformat()
     
     try:
         # Using CoinGecko public API (no auth required)
@@ -209,40 +320,40 @@ def collect_crypto_prices():
             'include_market_cap': 'true'
         }
         
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = get_json(url, params=params)
         
-        crypto_data = []
-        for coin, info in data.items():
-            crypto_data.append({
+        crypto_data = [
+            {
                 'coin': coin,
                 'price_usd': info.get('usd', 0),
                 'market_cap': info.get('usd_market_cap', 0),
                 'change_24h': info.get('usd_24h_change', 0),
-                'collected_at': datetime.now().isoformat()
-            })
+                'collected_at': collected_at
+            }
+            for coin, info in data.items()
+        ]
         
         # Save to file
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'data/raw/crypto_{timestamp}.json'
-        
-        with open(filename, 'w') as f:
-            json.dump({
-                'collected_at': datetime.now().isoformat(),
-                'source': 'CoinGecko API',
-                'data': crypto_data
-            }, f, indent=2)
+        filename = save_raw('crypto', crypto_data, 'CoinGecko API', now)
         
-        logger.info(f"Crypto data saved to {filename}")
+        logger.info("Crypto data saved to %s", filename)
         return crypto_data
         
     except Exception as e:
-        logger.error(f"Error collecting crypto data: {e}")
+        logger.error("Error collecting crypto data: %s", e)
         return []
 
 
+async def collect_all():
+    """Run all collectors concurrently; blocking collectors run in worker threads."""
+    return await asyncio.gather(
+        asyncio.to_thread(collect_github_trending),
+        asyncio.to_thread(collect_hn_stories),
+        collect_weather_data(),
+        asyncio.to_thread(collect_crypto_prices)
+    )
+
+
 def main():
     """Main execution function."""
     logger.info("=" * 50)
@@ -255,19 +366,16 @@ def main():
     # Clean up old files first
     cleanup_old_files(days_to_keep=7)
 
-    # Collect data from various sources
-    github_data = collect_github_trending()
-    hn_data = collect_hn_stories()
-    weather_data = collect_weather_data()
-    crypto_data = collect_crypto_prices()
+    # Collect data from various sources (independent, so run concurrently)
+    github_data, hn_data, weather_data, crypto_data = asyncio.run(collect_all())
 
     # Summary
     logger.info("=" * 50)
     logger.info("Data collection complete!")
-    logger.info(f"GitHub repos collected: {len(github_data)}")
-    logger.info(f"HN stories collected: {len(hn_data)}")
-    logger.info(f"Weather data points: {len(weather_data)}")
-    logger.info(f"Crypto currencies: {len(crypto_data)}")
+    logger.info("GitHub repos collected: %s", len(github_data))
+    logger.info("HN stories collected: %s", len(hn_data))
+    logger.info("Weather data points: %s", len(weather_data))
+    logger.info("Crypto currencies: %s", len(crypto_data))
     logger.info("=" * 50)
 
 
@@ -4,12 +4,19 @@ Data Processing Script
 Processes raw data and generates insights.
 """
 
+import csv
 import json
 import glob
-import pandas as pd
+import gzip
+import statistics
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
-import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -19,12 +26,53 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def dumps_json(obj):
+    """Serialize obj to indented JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
+def loads_json(data):
+    """Parse JSON from bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def get_latest_file(pattern):
-    """Get the most recent file matching the pattern."""
+    """Get the most recent file matching the pattern.
+
+    Filenames embed a %Y%m%d_%H%M%S timestamp, so the lexicographic max is
+    also the newest file and no stat() calls are needed.
+    """
     files = glob.glob(pattern)
     if not files:
         return None
-    return max(files, key=os.path.getctime)
+    return max(files)
+
+
+def load_raw(path):
+    """Load a raw data file, decompressing .json.gz files."""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        return loads_json(f.read())
+
+
+def write_csv(rows, output_file):
+    """Write a list of dicts to CSV, using the first row's keys as the header."""
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        if not rows:
+            return
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()), lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def count_csv_rows(path):
+    """Count the data rows in a CSV file by counting lines after the header."""
+    with open(path, 'rb') as f:
+        return max(sum(1 for _ in f) - 1, 0)
 
 
 def process_github_data():
@@ -32,27 +80,25 @@ def process_github_data():
     logger.info("Processing GitHub data...")
     
     try:
-        latest_file = get_latest_file('data/raw/github_trending_*.json')
+        latest_file = get_latest_file('data/raw/github_trending_*.json*')
         if not latest_file:
             logger.warning("No GitHub data file found")
             return None
         
-        with open(latest_file, 'r') as f:
-            data = json.load(f)
+        data = load_raw(latest_file)
         
-        # Convert to DataFrame for easier processing
-        df = pd.DataFrame(data['data'])
+        rows = data['data']
         
         # Save processed data
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         output_file = f'data/processed/github_processed_{timestamp}.csv'
-        df.to_csv(output_file, index=False)
+        write_csv(rows, output_file)
         
-        logger.info(f"Processed GitHub data saved to {output_file}")
-        return df
+        logger.info("Processed GitHub data saved to %s", output_file)
+        return rows
         
     except Exception as e:
-        logger.error(f"Error processing GitHub data: {e}")
+        logger.error("Error processing GitHub data: %s", e)
         return None
 
 
@@ -61,35 +107,30 @@ def process_weather_data():
     logger.info("Processing weather data...")
     
     try:
-        latest_file = get_latest_file('data/raw/weather_*.json')
+        latest_file = get_latest_file('data/raw/weather_*.json*')
         if not latest_file:
             logger.warning("No weather data file found")
             return None
         
-        with open(latest_file, 'r') as f:
-            data = json.load(f)
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(data['data'])
+        data = load_raw(latest_file)
         
-        # Add some calculated fields
-        df['temperature_c'] = pd.to_numeric(df['temperature_c'])
-        df['humidity'] = pd.to_numeric(df['humidity'])
+        rows = data['data']
         
         # Calculate average temperature for Vancouver
-        avg_temp = df['temperature_c'].mean()
-        logger.info(f"Average temperature for Vancouver: {avg_temp:.1f}°C")
+        if rows:
+            avg_temp = statistics.fmean(float(r['temperature_c']) for r in rows)
+            logger.info("Average temperature for Vancouver: %.1f°C", avg_temp)
         
         # Save processed data
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         output_file = f'data/processed/weather_processed_{timestamp}.csv'
-        df.to_csv(output_file, index=False)
+        write_csv(rows, output_file)
         
-        logger.info(f"Processed weather data saved to {output_file}")
-        return df
+        logger.info("Processed weather data saved to %s", output_file)
+        return rows
         
     except Exception as e:
-        logger.error(f"Error processing weather data: {e}")
+        logger.error("Error processing weather data: %s", e)
         return None
 
 
@@ -98,34 +139,33 @@ def process_crypto_data():
     logger.info("Processing crypto data...")
     
     try:
-        latest_file = get_latest_file('data/raw/crypto_*.json')
+        latest_file = get_latest_file('data/raw/crypto_*.json*')
         if not latest_file:
             logger.warning("No crypto data file found")
             return None
         
-        with open(latest_file, 'r') as f:
-            data = json.load(f)
+        data = load_raw(latest_file)
         
-        # Convert to DataFrame
-        df = pd.DataFrame(data['data'])
+        rows = data['data']
         
-        # Format numbers
-        df['price_usd'] = pd.to_numeric(df['price_usd'])
-        df['change_24h'] = pd.to_numeric(df['change_24h'])
-        
-        # Add trend indicator
-        df['trend'] = df['change_24h'].apply(lambda x: '📈' if x > 0 else '📉')
+        for row in rows:
+            # Format numbers
+            row['price_usd'] = float(row['price_usd'])
+            row['change_24h'] = float(row['change_24h'])
+            
+            # Add trend indicator
+            row['trend'] = '📈' if row['change_24h'] > 0 else '📉'
         
         # Save processed data
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         output_file = f'data/processed/crypto_processed_{timestamp}.csv'
-        df.to_csv(output_file, index=False)
+        write_csv(rows, output_file)
         
-        logger.info(f"Processed crypto data saved to {output_file}")
-        return df
+        logger.info("Processed crypto data saved to %s", output_file)
+        return rows
         
     except Exception as e:
-        logger.error(f"Error processing crypto data: {e}")
+        logger.error("Error processing crypto data: %s", e)
         return None
 
 
@@ -134,30 +174,33 @@ def process_hn_data():
     logger.info("Processing HN data...")
 
     try:
-        latest_file = get_latest_file('data/raw/hn_stories_*.json')
+        latest_file = get_latest_file('data/raw/hn_stories_*.json*')
         if not latest_file:
             logger.warning("No HN data file found")
             return None
 
-        with open(latest_file, 'r') as f:
-            data = json.load(f)
+        data = load_raw(latest_file)
 
-        df = pd.DataFrame(data['data'])
+        rows = data['data']
 
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         output_file = f'data/processed/hn_processed_{timestamp}.csv'
-        df.to_csv(output_file, index=False)
+        write_csv(rows, output_file)
 
-        logger.info(f"Processed HN data saved to {output_file}")
-        return df
+        logger.info("Processed HN data saved to %s", output_file)
+        return rows
 
     except Exception as e:
-        logger.error(f"Error processing HN data: {e}")
+        logger.error("Error processing HN data: %s", e)
         return None
 
 
-def generate_summary():
-    """Generate summary statistics."""
+def generate_summary(processed=None):
+    """Generate summary statistics.
+
+    Counts come from the in-memory ``processed`` rows where available; other
+    sources fall back to the latest processed CSV.
+    """
     logger.info("Generating summary statistics...")
     
     summary = {
@@ -169,36 +212,38 @@ def generate_summary():
     }
 
     try:
-        github_files = glob.glob('data/processed/github_processed_*.csv')
-        hn_files = glob.glob('data/processed/hn_processed_*.csv')
-        weather_files = glob.glob('data/processed/weather_processed_*.csv')
-        crypto_files = glob.glob('data/processed/crypto_processed_*.csv')
+        sources = {
+            'github_repos_analyzed': 'github',
+            'hn_stories_tracked': 'hn',
+            'weather_cities_tracked': 'weather',
+            'crypto_currencies_tracked': 'crypto'
+        }
+        processed = processed or {}
 
-        if github_files:
-            df = pd.read_csv(github_files[-1])
-            summary['github_repos_analyzed'] = len(df)
+        latest_files = {}
+        for key, source in sources.items():
+            rows = processed.get(source)
+            if rows is not None:
+                summary[key] = len(rows)
+                continue
+            latest_file = get_latest_file(f'data/processed/{source}_processed_*.csv')
+            if latest_file:
+                latest_files[key] = latest_file
 
-        if hn_files:
-            df = pd.read_csv(hn_files[-1])
-            summary['hn_stories_tracked'] = len(df)
-
-        if weather_files:
-            df = pd.read_csv(weather_files[-1])
-            summary['weather_cities_tracked'] = len(df)
-
-        if crypto_files:
-            df = pd.read_csv(crypto_files[-1])
-            summary['crypto_currencies_tracked'] = len(df)
+        # Count rows in any remaining files concurrently
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            counts = executor.map(count_csv_rows, latest_files.values())
+            summary.update(zip(latest_files.keys(), counts))
         
         # Save summary
-        with open('data/processed/summary.json', 'w') as f:
-            json.dump(summary, f, indent=2)
+        with open('data/processed/summary.json', 'wb') as f:
+            f.write(dumps_json(summary))
         
         logger.info("Summary generated successfully")
         return summary
         
     except Exception as e:
-        logger.error(f"Error generating summary: {e}")
+        logger.error("Error generating summary: %s", e)
         return summary
 
 
@@ -208,24 +253,32 @@ def main():
     logger.info("Starting data processing pipeline")
     logger.info("=" * 50)
     
-    # Process all data sources
-    github_df = process_github_data()
-    hn_df = process_hn_data()
-    weather_df = process_weather_data()
-    crypto_df = process_crypto_data()
+    # Process all data sources concurrently; each is independent file I/O
+    processors = [process_github_data, process_hn_data, process_weather_data, process_crypto_data]
+    with ThreadPoolExecutor(max_workers=len(processors)) as executor:
+        github_rows, hn_rows, weather_rows, crypto_rows = executor.map(lambda f: f(), processors)
+
+    processed = {
+        'github': github_rows,
+        'hn': hn_rows,
+        'weather': weather_rows,
+        'crypto': crypto_rows
+    }
 
     # Generate summary
-    summary = generate_summary()
+    summary = generate_summary(processed)
 
     # Log results
     logger.info("=" * 50)
     logger.info("Data processing complete!")
-    logger.info(f"GitHub repos: {summary['github_repos_analyzed']}")
-    logger.info(f"HN stories: {summary['hn_stories_tracked']}")
-    logger.info(f"Weather cities: {summary['weather_cities_tracked']}")
-    logger.info(f"Crypto currencies: {summary['crypto_currencies_tracked']}")
+    logger.info("GitHub repos: %s", summary['github_repos_analyzed'])
+    logger.info("HN stories: %s", summary['hn_stories_tracked'])
+    logger.info("Weather cities: %s", summary['weather_cities_tracked'])
+    logger.info("Crypto currencies: %s", summary['crypto_currencies_tracked'])
     logger.info("=" * 50)
 
+    return processed
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Pipeline Runner Script
+Runs collection, processing and the README update in a single process so
+processed rows are handed straight to the README stage instead of being
+re-read from the CSVs that were just written.
+"""
+
+import collect_data
+import process_data
+import update_readme
+
+
+def main():
+    """Main execution function."""
+    collect_data.main()
+    processed = process_data.main()
+    update_readme.main(processed)
+
+
+if __name__ == "__main__":
+    main()
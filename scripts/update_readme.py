@@ -4,12 +4,18 @@ README Update Script
 Updates the README.md file with the latest processed data.
 """
 
+import csv
 import json
 import glob
-import pandas as pd
+import re
+import statistics
 from datetime import datetime
 import logging
-import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -19,24 +25,62 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def dumps_json(obj):
+    """Serialize obj to indented JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
+# README patterns, compiled once at import time. Each section pattern
+# captures the table header and separator and consumes the old data rows.
+GITHUB_RE = re.compile(
+    r'^### GitHub Trending Repositories.*\n(?:.*\n)*?(\| Repository.*\n(?:\|---.*\n)?)(?:(?:\|.*|[ \t]*)\n)*',
+    re.MULTILINE
+)
+HN_RE = re.compile(
+    r'^### Hacker News Top Stories.*\n(?:.*\n)*?(\| Title.*\n(?:\|---.*\n)?)(?:(?:\|.*|[ \t]*)\n)*',
+    re.MULTILINE
+)
+WEATHER_RE = re.compile(
+    r'^(### Weather Data Summary.*\n(?:.*\n)*?\| Metric.*\n(?:\|---.*\n)?)(?:(?:\|.*|[ \t]*)\n)*',
+    re.MULTILINE
+)
+TIMESTAMP_RE = re.compile(
+    r'^\*This README is automatically updated by the data pipeline\. Last update: .*\*$',
+    re.MULTILINE
+)
+LAST_UPDATED_RE = re.compile(r'(?<=Last Updated: )[^)]*|(?<=Last update: )[^*]*')
+
+
 def get_latest_file(pattern):
-    """Get the most recent file matching the pattern."""
+    """Get the most recent file matching the pattern.
+
+    Filenames embed a %Y%m%d_%H%M%S timestamp, so the lexicographic max is
+    also the newest file and no stat() calls are needed.
+    """
     files = glob.glob(pattern)
     if not files:
         return None
-    return max(files, key=os.path.getctime)
+    return max(files)
+
 
+def read_csv_rows(path):
+    """Read a CSV file into a list of dicts."""
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
 
-def format_github_table(df):
+
+def format_github_table(rows):
     """Format GitHub data as a markdown table."""
-    if df is None or len(df) == 0:
+    if not rows:
         return "| *Data will be populated by automated pipeline* | - | - | - |"
     
     table_rows = []
-    for _, row in df.head(5).iterrows():  # Show top 5
+    for row in rows[:5]:  # Show top 5
         name = row['name']
         stars = f"{int(row['stars']):,}"
-        language = row['language'] if pd.notna(row['language']) else 'N/A'
+        language = row['language'] or 'N/A'
         description = row['description'][:80] + "..." if len(row['description']) > 80 else row['description']
         
         table_rows.append(f"| [{name}]({row['url']}) | {stars} | {language} | {description} |")
@@ -44,13 +88,13 @@ def format_github_table(df):
     return "\n".join(table_rows)
 
 
-def format_hn_table(df):
+def format_hn_table(rows):
     """Format Hacker News data as a markdown table."""
-    if df is None or len(df) == 0:
+    if not rows:
         return "| *Data will be populated by automated pipeline* | - | - |"
 
     table_rows = []
-    for _, row in df.head(10).iterrows():
+    for row in rows[:10]:
         title = str(row['title'])[:80] + "..." if len(str(row['title'])) > 80 else str(row['title'])
         url = row['url']
         score = int(row['score'])
@@ -62,187 +106,123 @@ def format_hn_table(df):
     return "\n".join(table_rows)
 
 
-def format_weather_table(df):
+def format_weather_table(rows):
     """Format weather data as a markdown table."""
-    if df is None or len(df) == 0:
+    if not rows:
         return "| *Data will be populated by automated pipeline* | - |"
     
     # Calculate summary statistics for Vancouver
-    avg_temp_c = df['temperature_c'].mean()
-    avg_temp_f = df['temperature_f'].mean()
-    avg_humidity = df['humidity'].mean()
+    avg_temp_c = statistics.fmean(float(r['temperature_c']) for r in rows)
+    avg_temp_f = statistics.fmean(float(r['temperature_f']) for r in rows)
+    avg_humidity = statistics.fmean(float(r['humidity']) for r in rows)
     
-    city_name = df['city'].iloc[0] if len(df) > 0 else "Vancouver"
+    city_name = rows[0]['city']
     
     table_rows = [
         f"| City Tracked | {city_name} |",
         f"| Average Temperature | {avg_temp_c:.1f}°C ({avg_temp_f:.1f}°F) |",
         f"| Average Humidity | {avg_humidity:.0f}% |",
-        f"| Data Points | {len(df)} |"
+        f"| Data Points | {len(rows)} |"
     ]
     
     return "\n".join(table_rows)
 
 
-def update_readme():
-    """Update the README.md file with latest data."""
+def load_processed_rows(processed=None):
+    """Return processed rows per source, reading the latest CSV for any not passed in."""
+    processed = dict(processed or {})
+    sources = [
+        ('github', 'GitHub', 'repositories'),
+        ('hn', 'HN', 'stories'),
+        ('weather', 'weather', 'cities')
+    ]
+
+    for key, label, unit in sources:
+        if processed.get(key) is not None:
+            continue
+        latest_file = get_latest_file(f'data/processed/{key}_processed_*.csv')
+        if latest_file:
+            processed[key] = read_csv_rows(latest_file)
+            logger.info("Loaded %s data: %s %s", label, len(processed[key]), unit)
+        else:
+            processed[key] = None
+            logger.warning("No %s data file found", label)
+
+    return processed
+
+
+def update_readme(github_rows, hn_rows, weather_rows):
+    """Update the README.md file with the given processed rows."""
     logger.info("Updating README.md...")
     
     try:
         # Read current README
         with open('README.md', 'r') as f:
-            lines = f.readlines()
+            old_content = f.read()
+        content = old_content
         
-        # Get latest processed data
-        github_file = get_latest_file('data/processed/github_processed_*.csv')
-        hn_file = get_latest_file('data/processed/hn_processed_*.csv')
-        weather_file = get_latest_file('data/processed/weather_processed_*.csv')
-
-        github_df = None
-        hn_df = None
-        weather_df = None
-
-        if github_file:
-            github_df = pd.read_csv(github_file)
-            logger.info(f"Loaded GitHub data: {len(github_df)} repositories")
-        else:
-            logger.warning("No GitHub data file found")
-
-        if hn_file:
-            hn_df = pd.read_csv(hn_file)
-            logger.info(f"Loaded HN data: {len(hn_df)} stories")
-        else:
-            logger.warning("No HN data file found")
-
-        if weather_file:
-            weather_df = pd.read_csv(weather_file)
-            logger.info(f"Loaded weather data: {len(weather_df)} cities")
-        else:
-            logger.warning("No weather data file found")
-
         # Format tables
-        github_table = format_github_table(github_df)
-        hn_table = format_hn_table(hn_df)
-        weather_table = format_weather_table(weather_df)
+        github_table = format_github_table(github_rows)
+        hn_table = format_hn_table(hn_rows)
+        weather_table = format_weather_table(weather_rows)
         
         # Get current timestamp
         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
         
-        # Process line by line
-        new_lines = []
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            
-            # Update HN section
-            if line.startswith('### Hacker News Top Stories'):
-                new_lines.append(f'### Hacker News Top Stories (Last Updated: {current_time})\n')
-                i += 1
-                while i < len(lines) and not lines[i].startswith('| Title'):
-                    i += 1
-                if i < len(lines):
-                    new_lines.append(lines[i])  # header
-                    i += 1
-                    if i < len(lines) and lines[i].startswith('|---'):
-                        new_lines.append(lines[i])  # separator
-                        i += 1
-                    while i < len(lines) and not lines[i].startswith('###') and not lines[i].startswith('##'):
-                        if lines[i].strip() and not lines[i].startswith('|'):
-                            break
-                        i += 1
-                    new_lines.append(hn_table + '\n')
-                    new_lines.append('\n')
-                continue
-
-            # Update GitHub section
-            if line.startswith('### GitHub Trending Repositories'):
-                new_lines.append(f'### GitHub Trending Repositories (Last Updated: {current_time})\n')
-                i += 1
-                # Skip until we find the table header
-                while i < len(lines) and not lines[i].startswith('| Repository'):
-                    i += 1
-                if i < len(lines):
-                    new_lines.append(lines[i])  # Add header
-                    i += 1
-                    if i < len(lines) and lines[i].startswith('|---'):
-                        new_lines.append(lines[i])  # Add separator
-                        i += 1
-                    # Skip old data rows until next section
-                    while i < len(lines) and not lines[i].startswith('###') and not lines[i].startswith('##'):
-                        if lines[i].strip() and not lines[i].startswith('|'):
-                            break
-                        i += 1
-                    # Add new data
-                    new_lines.append(github_table + '\n')
-                    new_lines.append('\n')  # Add blank line after table
-                continue
-            
-            # Update Weather section
-            elif line.startswith('### Weather Data Summary'):
-                new_lines.append(line)
-                i += 1
-                # Skip until we find the table header
-                while i < len(lines) and not lines[i].startswith('| Metric'):
-                    new_lines.append(lines[i])
-                    i += 1
-                if i < len(lines):
-                    new_lines.append(lines[i])  # Add header
-                    i += 1
-                    if i < len(lines) and lines[i].startswith('|---'):
-                        new_lines.append(lines[i])  # Add separator
-                        i += 1
-                    # Skip old data rows until next section
-                    while i < len(lines) and not lines[i].startswith('##'):
-                        if lines[i].strip() and not lines[i].startswith('|'):
-                            break
-                        i += 1
-                    # Add new data
-                    new_lines.append(weather_table + '\n')
-                    new_lines.append('\n')  # Add blank line after table
-                continue
-            
-            # Update timestamp at bottom
-            elif '*This README is automatically updated' in line:
-                new_lines.append(f'*This README is automatically updated by the data pipeline. Last update: {current_time}*\n')
-                i += 1
-                continue
-            
-            new_lines.append(line)
-            i += 1
+        # Replace each section's table rows in a single regex pass
+        content = GITHUB_RE.sub(
+            lambda m: f'### GitHub Trending Repositories (Last Updated: {current_time})\n{m.group(1)}{github_table}\n\n',
+            content
+        )
+        content = HN_RE.sub(
+            lambda m: f'### Hacker News Top Stories (Last Updated: {current_time})\n{m.group(1)}{hn_table}\n\n',
+            content
+        )
+        content = WEATHER_RE.sub(
+            lambda m: f'{m.group(1)}{weather_table}\n\n',
+            content
+        )
+        content = TIMESTAMP_RE.sub(
+            lambda m: f'*This README is automatically updated by the data pipeline. Last update: {current_time}*',
+            content
+        )
+        
+        # Skip the write when only the timestamps would change
+        if LAST_UPDATED_RE.sub('', content) == LAST_UPDATED_RE.sub('', old_content):
+            logger.info("README.md data unchanged; skipping write")
+            return True
         
         # Write updated README
         with open('README.md', 'w') as f:
-            f.writelines(new_lines)
+            f.write(content)
         
         logger.info("README.md updated successfully!")
         return True
         
     except Exception as e:
-        logger.error(f"Error updating README: {e}")
+        logger.error("Error updating README: %s", e)
         import traceback
         traceback.print_exc()
         return False
 
 
-def write_latest_json(github_df, hn_df):
+def write_latest_json(github_data, hn_data):
     """Write data/latest.json — fixed filename for the dashboard to fetch."""
-    import json as _json
-
     github_rows = []
-    if github_df is not None and len(github_df) > 0:
-        for _, row in github_df.head(10).iterrows():
+    if github_data:
+        for row in github_data[:10]:
             github_rows.append({
                 'name': row['name'],
                 'stars': int(row['stars']),
-                'language': row['language'] if pd.notna(row['language']) else 'N/A',
+                'language': row['language'] or 'N/A',
                 'description': str(row['description']),
                 'url': str(row['url']),
                 'created_at': str(row['created_at']) if 'created_at' in row else ''
             })
 
     hn_rows = []
-    if hn_df is not None and len(hn_df) > 0:
-        for _, row in hn_df.head(10).iterrows():
+    if hn_data:
+        for row in hn_data[:10]:
             hn_rows.append({
                 'title': str(row['title']),
                 'url': str(row['url']),
@@ -258,25 +238,25 @@ def write_latest_json(github_df, hn_df):
         'hn_stories': hn_rows
     }
 
-    with open('data/latest.json', 'w') as f:
-        _json.dump(payload, f, indent=2)
+    with open('data/latest.json', 'wb') as f:
+        f.write(dumps_json(payload))
 
     logger.info("data/latest.json written")
 
 
-def main():
-    """Main execution function."""
+def main(processed=None):
+    """Main execution function.
+
+    ``processed`` maps source names to rows already held in memory (see
+    run_pipeline.py); any source missing from it is read from its latest CSV.
+    """
     logger.info("=" * 50)
     logger.info("Starting README update")
     logger.info("=" * 50)
 
-    success = update_readme()
-
-    github_file = get_latest_file('data/processed/github_processed_*.csv')
-    hn_file = get_latest_file('data/processed/hn_processed_*.csv')
-    github_df = pd.read_csv(github_file) if github_file else None
-    hn_df = pd.read_csv(hn_file) if hn_file else None
-    write_latest_json(github_df, hn_df)
+    processed = load_processed_rows(processed)
+    success = update_readme(processed['github'], processed['hn'], processed['weather'])
+    write_latest_json(processed['github'], processed['hn'])
 
     if success:
         logger.info("=" * 50)